@@ -1,5 +1,6 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
 import altair as alt
 import plotly.express as px
 import plotly.graph_objects as go
@@ -21,13 +22,20 @@ st.sidebar.markdown("""
 """, unsafe_allow_html=True)
 
 @st.cache_data
-
 def load_data():
-    df = pd.read_csv("data/covid_articles_matched_qids.csv")
+    # typed Parquet copy of the CSV (see convert_to_parquet.ipynb), so no parsing on a cold start
+    df = pd.read_parquet(
+        "data/covid_articles_matched_qids.parquet",
+        columns=["date", "article", "pageviews"]
+    )
+    df["year"] = df["date"].dt.year.astype("int16")
+    # truncate to month start with a numpy cast instead of to_period("M").dt.to_timestamp()
+    df["month"] = df["date"].values.astype("datetime64[M]").astype("datetime64[ns]")
+    # sorted DatetimeIndex so date lookups are binary searches instead of full-column scans
+    df = df.sort_values("date", kind="stable").set_index("date")
     return df
 
 df = load_data()
-df["date"] = pd.to_datetime(df["date"])
 
 st.title("Shifts in COVID-19 Global Public Interest", anchor="overview")
 st.markdown("#### **How has public engagement in COVID-19 shifted during the post-pandemic period, as reflected in Wikipedia pageviews from 2023–2024?**")
@@ -51,29 +59,41 @@ st.markdown("""
 st.subheader("Data Summary", anchor="data-summary")
 st.write("The dataset consists of articles from the WikiProject COVID-19 Wikipedia page with their respective pageviews from 02-06-2023 to 12-31-2024. Only articles with **top**, **high**, and **medium** importance levels were included for relevancy. QIDs were matched with all Wikipedia data to get global pageviews.")
 st.write("Preview of the raw data:")
-st.dataframe(df.head())
+# first lines of the file with every column; load_data() only keeps the columns the charts use
+@st.cache_data
+def load_preview_data():
+    df = pd.read_csv("data/covid_articles_matched_qids.csv", nrows=5, parse_dates=["date"])
+    return df
+
+st.dataframe(load_preview_data())
+
+@st.cache_data
+def dataset_summary(_df):
+    return len(_df), int(_df['pageviews'].sum()), float(_df['pageviews'].mean())
+
+total_articles, total_pageviews, avg_pageviews = dataset_summary(df)
 
 col1, col2, col3 = st.columns([1, 1, 1])
 with col1:
     st.markdown("##### Total Articles:")
-    st.write(f"{df['article'].count():,}")
+    st.write(f"{total_articles:,}")
 
 with col2:
     st.markdown("##### Total Pageviews (All Years):")
-    st.write(f"{df['pageviews'].sum():,}")
+    st.write(f"{total_pageviews:,}")
 
 with col3:
     st.markdown("##### Average Pageviews:")
-    st.write(f"{df['pageviews'].mean():.2f}")
+    st.write(f"{avg_pageviews:.2f}")
 
 # -------- Total Pageviews Over Time --------
 st.subheader("Total COVID-19 Pageviews Over Time", anchor="total-pageviews")
+@st.cache_data
 def load_peak_data():
-    df = pd.read_csv("data/known_peaks.csv")
+    df = pd.read_csv("data/known_peaks.csv", engine="pyarrow", index_col=0, parse_dates=["date"])
     return df
 
 df_peaks = load_peak_data()
-df_peaks['date'] = pd.to_datetime(df_peaks['date']) 
 
 st.write("This time series displays total Wikipedia pageviews of COVID-19-related articles from 2023 to 2024. " \
 "Prominent peaks are dynamically annotated on the graph with a red circle, and if hovered over, the date of the peak along " \
@@ -81,8 +101,8 @@ st.write("This time series displays total Wikipedia pageviews of COVID-19-relate
 annotate_peaks = st.checkbox("Show Prominent Peaks", value=True)
 
 # Date range slider
-min_date = df["date"].min().to_pydatetime()
-max_date = df["date"].max().to_pydatetime()
+min_date = df.index[0].to_pydatetime()
+max_date = df.index[-1].to_pydatetime()
 
 start_date, end_date = st.slider(
     "Select Date Range",
@@ -92,49 +112,45 @@ start_date, end_date = st.slider(
     format="YYYY-MM-DD"
 )
 
-df_filtered = df[(df["date"] >= start_date) & (df["date"] <= end_date)]
 df_peaks_filtered = df_peaks[(df_peaks['date'] >= start_date) & (df_peaks['date'] <= end_date)]
 
-# Total daily pageviews
-daily = df_filtered.groupby("date")["pageviews"].sum().reset_index()
-
-fig = px.line(daily, x='date', y='pageviews', 
-              labels={'date': 'Date', 'pageviews': 'Total Pageviews'})
+# Total daily pageviews, aggregated once and sliced by the selected range
+@st.cache_data
+def daily_totals(_df):
+    return _df.groupby("date", sort=True)["pageviews"].sum()
+
+daily_all = daily_totals(df)
+daily = daily_all.loc[start_date:end_date].reset_index()
+
+# WebGL trace so the browser draws the line in one call instead of one SVG node per point
+fig = go.Figure(go.Scattergl(
+    x=daily['date'],
+    y=daily['pageviews'],
+    mode='lines',
+    showlegend=False,
+    hovertemplate='Date=%{x}<br>Total Pageviews=%{y}<extra></extra>'
+))
+fig.update_layout(xaxis_title='Date', yaxis_title='Total Pageviews', margin=dict(t=60))
 
 # Dynamic Peak Annotation w/ Hover (Plotly)
 if annotate_peaks and not df_peaks_filtered.empty:
     
-    hover_texts = []
-    for _, row in df_peaks_filtered.iterrows():
-        peak_date = row["date"]
-        peak_total_views = row["pageviews"]
-
-        # Get article contributions on that date 
-        daily_articles = df[df["date"] == peak_date]
-
-        article_summary = (
-            daily_articles
-            .groupby("article", as_index=False)["pageviews"]
-            .sum()
-            .sort_values("pageviews", ascending=False)
-        )
-
-        top = article_summary.head(3)
-        
-        # Build the multi-line text using HTML breaks (<br>)
-        annotation_text = (
-            f"<b>Peak: {peak_date.strftime('%b %d, %Y')}</b>"
-            f"<br>{int(peak_total_views):,} views"
+    # top 3 article shares per peak are precomputed in known_peaks.csv (see df_peaks.ipynb)
+    # Build the multi-line text using HTML breaks (<br>), one column at a time
+    hover_texts = (
+        "<b>Peak: " + df_peaks_filtered["date"].dt.strftime("%b %d, %Y") + "</b>"
+        + df_peaks_filtered["pageviews"].map("<br>{:,} views".format)
+    )
+    for i in range(1, 4):
+        article_line = (
+            "<br>" + df_peaks_filtered[f"top{i}_article"] + ": "
+            + df_peaks_filtered[f"top{i}_pct"].map("{:.2f}%".format)
         )
-
-        for _, a in top.iterrows():
-            percent = (a["pageviews"] / peak_total_views) * 100 if peak_total_views > 0 else 0
-            annotation_text += f"<br>{a['article']}: {percent:.2f}%"
-        
-        hover_texts.append(annotation_text)
+        hover_texts += article_line.fillna("")
+    hover_texts = hover_texts.tolist()
 
     # Add peak markers with hover info
-    fig.add_trace(go.Scatter(
+    fig.add_trace(go.Scattergl(
         x=df_peaks_filtered['date'],
         y=df_peaks_filtered['pageviews'],
         mode='markers',
@@ -162,32 +178,34 @@ st.markdown("#### Total Pageviews in 2023 vs. 2024")
 
 st.write('Overall, there are more Wikipedia pageviews and thus higher public interest in COVID-19 in 2023 compared to 2024, mainly due to the extremely high views on the "Coronavirus" article in February 2023. This indicates a decline in public engagement in COVID-19 post-pandemic.')
 
-df["year"] = df["date"].dt.year
+yearly = df.groupby("year", as_index=False)["pageviews"].sum()
 
-yearly = df.groupby("year")["pageviews"].sum().reset_index()
+# Vega-Lite spec written directly to skip Altair's per-rerun schema validation
+bar_year_spec = {
+    "mark": "bar",
+    "encoding": {
+        "x": {"field": "year", "type": "nominal", "title": "Year"},
+        "y": {"field": "pageviews", "type": "quantitative", "title": "Total Pageviews"},
+        "color": {"field": "year", "type": "nominal", "legend": None},
+    },
+    "height": 400,
+}
 
-bar_year = alt.Chart(yearly).mark_bar().encode(
-    x=alt.X("year:N", title="Year"),
-    y=alt.Y("pageviews:Q", title="Total Pageviews"),
-    color=alt.Color("year:N", legend=None),
-).properties(height=400)
-
-st.altair_chart(bar_year, use_container_width=True)
+st.vega_lite_chart(yearly, bar_year_spec, use_container_width=True)
 
 # -------- Top Articles by Total Views --------
 st.subheader("Top 10 Most Popular COVID-19 Articles (2023–2024)", anchor="top-articles")
 
 top_articles = (
-    df.groupby("article")["pageviews"]
+    df.groupby("article", as_index=False, observed=True, sort=False)["pageviews"]
     .sum()
-    .reset_index()
-    .sort_values("pageviews", ascending=False)
-    .head(10)
+    .nlargest(10, "pageviews")
 )
+top_articles["article"] = top_articles["article"].cat.remove_unused_categories()
 
 bar = alt.Chart(top_articles).mark_bar().encode(
     x=alt.X("pageviews:Q", title="Total Pageviews"),
-    y=alt.Y("article:N", sort='-x', title="Article", axis=alt.Axis(labelLimit=300)),
+    y=alt.Y("article:N", sort=top_articles["article"].tolist(), title="Article", axis=alt.Axis(labelLimit=300)),
     color=alt.Color("article:N", title=" ", legend=None)  
 ).properties(height=500)
 
@@ -210,56 +228,71 @@ year_selected = st.selectbox(
     index=0
 )
 
-# Filter selected year
-df_year = df[df["date"].dt.year == year_selected]
-if exclude_coronavirus:
-    df_year = df_year[df_year["article"] != "Coronavirus"]
-
-# find top 10 articles for that year
-top10_articles = (
-    df_year.groupby("article")["pageviews"]
-    .sum()
-    .sort_values(ascending=False)
-    .head(10)
-    .index.tolist()
-)
-
-df_top10 = df_year[df_year["article"].isin(top10_articles)]
-
-df_top10["month"] = df_top10["date"].dt.to_period("M").dt.to_timestamp()
-
-# sum monthly pageviews
-monthly = (
-    df_top10.groupby(["month", "article"])["pageviews"]
-    .sum()
-    .reset_index()
-)
+# monthly pageviews for every article, aggregated once per session
+@st.cache_data
+def monthly_per_article(_df):
+    # once sorted by (article, month) each group is a contiguous run
+    df_sorted = _df.sort_values(["article", "month"])
+    codes = df_sorted["article"].cat.codes.to_numpy()
+    months = df_sorted["month"].to_numpy()
+    run_start = np.ones(len(df_sorted), dtype=bool)
+    run_start[1:] = (codes[1:] != codes[:-1]) | (months[1:] != months[:-1])
+    starts = np.flatnonzero(run_start)
+
+    return pd.DataFrame({
+        "month": months[starts],
+        "article": df_sorted["article"].array[starts],
+        "pageviews": np.add.reduceat(df_sorted["pageviews"].to_numpy(), starts, dtype=np.int64),
+    })
+
+# cached per (year, exclude) pair; the leading underscore keeps Streamlit from hashing the frame
+@st.cache_data
+def compute_top10_monthly(_monthly, year, exclude_coronavirus):
+    # Filter selected year
+    monthly_year = _monthly[_monthly["month"].dt.year == year]
+    if exclude_coronavirus:
+        monthly_year = monthly_year[monthly_year["article"] != "Coronavirus"]
+
+    # find top 10 articles for that year
+    top10_articles = (
+        monthly_year.groupby("article", observed=True, sort=False)["pageviews"]
+        .sum()
+        .nlargest(10)
+        .index.tolist()
+    )
 
-monthly_chart = (
-    alt.Chart(monthly)
-    .mark_line()
-    .encode(
-        x=alt.X("month:T", title="Month"),
-        y=alt.Y("pageviews:Q", title="Total Pageviews"),
-        color=alt.Color(
-            "article:N",
-            legend=alt.Legend(
-                title="Article",
-                labelLimit=200,
-                labelFontSize=12,    
-                symbolLimit=100    
-            )
-        ),
-        tooltip=[
-            alt.Tooltip("month:T", title="Month"),
-            alt.Tooltip("article:N", title="Article"),
-            alt.Tooltip("pageviews:Q", title="Pageviews")
+    # match on the integer category codes instead of hashing article strings
+    top10_codes = monthly_year["article"].cat.categories.get_indexer(top10_articles)
+    monthly_top10 = monthly_year[np.isin(monthly_year["article"].cat.codes.to_numpy(), top10_codes)]
+    return monthly_top10.assign(article=monthly_top10["article"].cat.remove_unused_categories())
+
+monthly = compute_top10_monthly(monthly_per_article(df), year_selected, exclude_coronavirus)
+
+monthly_spec = {
+    "mark": "line",
+    "encoding": {
+        "x": {"field": "month", "type": "temporal", "title": "Month"},
+        "y": {"field": "pageviews", "type": "quantitative", "title": "Total Pageviews"},
+        "color": {
+            "field": "article",
+            "type": "nominal",
+            "legend": {
+                "title": "Article",
+                "labelLimit": 200,
+                "labelFontSize": 12,
+                "symbolLimit": 100
+            }
+        },
+        "tooltip": [
+            {"field": "month", "type": "temporal", "title": "Month"},
+            {"field": "article", "type": "nominal", "title": "Article"},
+            {"field": "pageviews", "type": "quantitative", "title": "Pageviews"}
         ]
-    )
-    .properties(height=400)
-)
+    },
+    "height": 400,
+}
 
-st.altair_chart(monthly_chart, use_container_width=True)
+st.vega_lite_chart(monthly, monthly_spec, use_container_width=True)
 
 # -------- Category Analysis by Text Classification --------
 st.subheader("English COVID-19 Articles Category Classification", anchor="category-classification")
@@ -267,7 +300,7 @@ st.subheader("English COVID-19 Articles Category Classification", anchor="catego
 st.write("API calls to the Wikidata database were used to retrieve the label, description, and relevant attributes for only English COVID-19 articles given its QID. These semantic features were then compiled and feature engineered to assign the true category classifcation of the article.")
 st.write("To test a text classification technique, English COVID-19 articles were classified into one of 12 predicted candidate categories, shown below in the left table, using **zero-shot text classification**. The dataframe on the right displays a preview of the predicted categories for each article, the probability scores, and the true category (ground truth).")
 st.write('**Zero-shot classification model**: "facebook/bart-large-mnli" from Hugging Face')
-candidate_categories = [
+candidate_categories = (
     "misinformation",
     "vaccine",
     "treatment",
@@ -280,11 +313,17 @@ candidate_categories = [
     "societal impact",
     "timeline",
     "disease"
-]
+)
 df_cc = pd.DataFrame({"Categories": candidate_categories})
 
+@st.cache_data
 def load_category_data():
-    df = pd.read_csv("data/predicted_categories.csv")
+    df = pd.read_csv(
+        "data/predicted_categories.csv",
+        engine="pyarrow",
+        usecols=["article", "predicted_label", "score", "ground_truth"],
+        dtype={"predicted_label": "category", "ground_truth": "category"}
+    )
     return df
 
 df_category = load_category_data()
@@ -292,11 +331,8 @@ df_category = load_category_data()
 col1, col2 = st.columns([1, 3])
 with col1:
     st.markdown("#### Categories")
-    st.dataframe(df_cc, column_config={
-        "Categories": st.column_config.Column(
-            width=150
-        )},
-        use_container_width=False)
+    # static HTML table; the interactive grid is unnecessary for a fixed 12-row list
+    st.table(df_cc)
 
 with col2:
     st.markdown("#### Classification Prediction Data") 
@@ -304,15 +340,30 @@ with col2:
         "article": st.column_config.Column(width=500)},
         use_container_width=False)
 
-pred_counts = df_category["predicted_label"].value_counts().reset_index()
-pred_counts.columns = ["category", "count"]
-pred_counts["type"] = "Predicted"
+# df_category is static, so the count and accuracy tables are built once per session
+@st.cache_data
+def build_category_tables(_df):
+    # count predicted and true labels in one pass over both columns
+    labels = _df[["predicted_label", "ground_truth"]].melt(var_name="type", value_name="category")
+    labels["type"] = labels["type"].map({"predicted_label": "Predicted", "ground_truth": "True"})
+    combined = (
+        labels.groupby(["type", "category"], sort=False, observed=True)
+        .size()
+        .reset_index(name="count")
+        .sort_values(["type", "count"], ascending=[True, False], ignore_index=True)
+    )
+
+    # compare label values: the two categoricals have different category sets ("other" is never predicted)
+    correct = _df["predicted_label"].to_numpy() == _df["ground_truth"].to_numpy()
+    accuracy = (
+        _df.assign(correct=correct)
+        .groupby("ground_truth", as_index=False, observed=True)["correct"].mean()
+    )
+    accuracy.columns = ["Category", "Accuracy"]
 
-gt_counts = df_category["ground_truth"].value_counts().reset_index()
-gt_counts.columns = ["category", "count"]
-gt_counts["type"] = "True"
+    return combined, accuracy
 
-combined = pd.concat([pred_counts, gt_counts], ignore_index=True)
+combined, accuracy = build_category_tables(df_category)
 
 st.markdown("#### Predicted vs. True Category Distribution of English Articles")
 
@@ -342,14 +393,6 @@ st.plotly_chart(fig)
 
 st.markdown("#### Text Classification Evaluation")
 st.write("Below displays the prediction accuracy the classifier achieved for each ground truth category. Refer to the above bar chart for ground truth article distributions.")
-df_category["correct"] = (df_category["predicted_label"] == df_category["ground_truth"]).astype(int)
-
-accuracy = (
-    df_category.groupby("ground_truth")["correct"].mean().reset_index()
-)
-
-accuracy.columns = ["Category", "Accuracy"]
-
 st.dataframe(accuracy.sort_values(by="Accuracy", ascending=False))
 
 col1, col2, col3, col4 = st.columns([1, 1, 1, 1])
@@ -374,23 +417,21 @@ st.subheader('Category Popularity of COVID-19 Articles Over Time', anchor="categ
 
 st.write('The below visualizations depict how popularity and interest in specific COVID-19 article categories have changed from 2023 to 2024. The most notable trend is the sharp decrease in the "disease" category from February to March 2023, largely due to the exceedingly high pageviews from the "Coronavirus" article (classified as "disease") on February 24, 2023.' \
 ' The "disease" articles stay relatively high and consistent in pageviews for the rest of the time period, and no other categories seemed to have significantly different patterns over time. However, "human" articles appear to have increased pageviews during October 2023. Additionally, pageviews for articles in the "societal impact" category are also relatively consistent from 2023 to 2024.')
+@st.cache_data
 def load_cat_pop_data():
-    df = pd.read_csv("data/categories_pageviews.csv")
-    return df
-
-cat_pgviews = load_cat_pop_data()
-cat_pgviews['date'] = pd.to_datetime(cat_pgviews['date'])
-
-cat_pgviews['month'] = cat_pgviews['date'].dt.to_period('M').dt.to_timestamp()
-
-category_monthly = (
-    cat_pgviews.groupby(['month', 'ground_truth'], as_index=False)['pageviews']
-      .sum()
-)
+    df = pd.read_parquet(
+        "data/categories_pageviews.parquet",
+        columns=["ground_truth", "date", "pageviews"]
+    )
+    df["month"] = df["date"].values.astype("datetime64[M]").astype("datetime64[ns]")
+    # both charts only use monthly totals, so the whole pipeline is cached as one step
+    category_monthly = (
+        df.groupby(['month', 'ground_truth'], as_index=False, observed=True)['pageviews']
+          .sum()
+    )
+    return category_monthly
 
-category_monthly['total'] = (
-    category_monthly.groupby('month')['pageviews'].transform('sum')
-)
+category_monthly = load_cat_pop_data()
 
 fig = px.area(
     category_monthly,
@@ -408,23 +449,70 @@ fig.update_layout(
 
 st.plotly_chart(fig, use_container_width=True)
 
-fig = px.bar(
-    category_monthly,
-    x='ground_truth',
-    y='pageviews',
-    animation_frame=category_monthly['month'].dt.strftime('%b %Y'),
-    range_y=[0, category_monthly['pageviews'].max()]
-)
+# build the animation frames directly rather than through px.bar(animation_frame=...);
+# category_monthly is static, so the groupby and frame assembly run once per session
+# (the cached figure is still re-validated when it is unpickled on each rerun)
+@st.cache_data
+def build_category_animation(_category_monthly):
+    frames = []
+    for month, g in _category_monthly.groupby('month', sort=True):
+        label = month.strftime('%b %Y')
+        frames.append(go.Frame(
+            data=[go.Bar(
+                x=g['ground_truth'],
+                y=g['pageviews'],
+                hovertemplate=f'month={label}<br>ground_truth=%{{x}}<br>pageviews=%{{y}}<extra></extra>'
+            )],
+            name=label
+        ))
+
+    frame_args = {"frame": {"duration": 0, "redraw": True}, "mode": "immediate", "fromcurrent": True,
+                  "transition": {"duration": 0, "easing": "linear"}}
+
+    fig = go.Figure(
+        data=frames[0].data,
+        frames=frames,
+        layout=go.Layout(
+            xaxis_title='Category',
+            yaxis_title='Total Pageviews',
+            yaxis_range=[0, _category_monthly['pageviews'].max()],
+            barmode='relative',
+            margin={"t": 60},
+            updatemenus=[{
+                "type": "buttons",
+                "direction": "left",
+                "showactive": False,
+                "x": 0.1,
+                "y": 0,
+                "xanchor": "right",
+                "yanchor": "top",
+                "pad": {"r": 10, "t": 70},
+                "buttons": [
+                    {"label": "&#9654;", "method": "animate",
+                     "args": [None, {"frame": {"duration": 500, "redraw": True}, "mode": "immediate", "fromcurrent": True,
+                                     "transition": {"duration": 500, "easing": "linear"}}]},
+                    {"label": "&#9724;", "method": "animate", "args": [[None], frame_args]}
+                ]
+            }],
+            sliders=[{
+                "active": 0,
+                "y": -0.05, # move closer to plot
+                "x": 0.1,
+                "len": 0.85,
+                "xanchor": "left",
+                "yanchor": "top",
+                "pad": {"b": 10, "t": 60},
+                "currentvalue": {"prefix": "month="},
+                "steps": [
+                    {"label": f.name, "method": "animate", "args": [[f.name], frame_args]}
+                    for f in frames
+                ]
+            }]
+        )
+    )
+    return fig
 
-fig.update_layout(
-    xaxis_title='Category',
-    yaxis_title='Total Pageviews',
-    sliders=[{
-        "y": -0.05, # move closer to plot
-        "x": 0.1,
-        "len": 0.85
-    }]
-)
+fig = build_category_animation(category_monthly)
 
 st.plotly_chart(fig, use_container_width=True)
 